@@ -13,10 +13,10 @@ Author: MIT AI Studio Student
 """
 
 import os
+import json
 from datetime import datetime
 from typing import Dict, Any
 from crewai import Agent, Task, Crew, Process
-from crewai_tools import FileWriterTool
 
 # Import our comprehensive health data model
 from health_data_model import (
@@ -25,6 +25,12 @@ from health_data_model import (
     EnvironmentalMetrics, WorkoutMetrics, NutritionMetrics,
     create_sample_health_data
 )
+from plan_schema import WorkoutPlan, NutritionPlan
+from plan_renderer import render_workout_plan, render_nutrition_plan
+from plan_version_store import PlanVersionStore
+
+PLAN_STORE_DIR = os.getenv('PLAN_STORE_DIR', 'plan_versions')
+PLAN_USER_ID = os.getenv('PLAN_USER_ID', 'local_user')
 
 def create_research_assistant_agent():
     """Create a Research Assistant agent that processes comprehensive health metrics."""
@@ -53,8 +59,7 @@ def create_fitness_content_writer_agent():
         You can design workouts for all fitness levels and adapt them based on real-time 
         health data from wearable devices.""",
         verbose=True,
-        allow_delegation=False,
-        tools=[FileWriterTool()]
+        allow_delegation=False
     )
 
 def create_nutrition_content_writer_agent():
@@ -68,8 +73,7 @@ def create_nutrition_content_writer_agent():
         composition goals, and metabolic health indicators. You specialize in meal timing, 
         macronutrient optimization, and hydration strategies for athletic performance.""",
         verbose=True,
-        allow_delegation=False,
-        tools=[FileWriterTool()]
+        allow_delegation=False
     )
 
 def create_health_analysis_task(agent, health_data: ComprehensiveHealthData):
@@ -120,20 +124,17 @@ Create a comprehensive workout plan that includes:
 
 The plan should directly address the findings from the health analysis and be aligned with the user's fitness level and goals.
 
-STEPS:
-1. Review the health analysis from the Research Assistant
-2. Create the workout plan content
-3. Use the File Writer Tool to save as 'personalized_workout_plan.md'""",
-        expected_output="""A detailed workout plan saved as 'personalized_workout_plan.md' containing:
-        - 7-day weekly schedule with specific workouts
-        - Exercise descriptions and proper form instructions
-        - Heart rate zone recommendations for each workout
-        - Progressive difficulty adjustments week by week
-        - Recovery strategies and rest day activities
-        - Injury prevention exercises and mobility work
-        - Performance tracking metrics and milestones
-        - Modifications for different fitness levels""",
-        agent=agent
+Return ONLY the structured plan fields. Do not write markdown, headings or formatting -
+the plan is rendered into markdown locally. Keep each item short and specific.""",
+        expected_output="""A structured workout plan containing:
+        - 7-day weekly schedule with specific exercises and intensity
+        - Heart rate zones (bpm ranges) derived from the user's metrics
+        - Warm-up and cool-down steps with durations
+        - Week-by-week progression adjustments
+        - Recovery, injury prevention and tracking recommendations
+        - Modifications for beginner and advanced fitness levels""",
+        agent=agent,
+        output_pydantic=WorkoutPlan
     )
 
 def create_nutrition_planning_task(agent, health_analysis_task):
@@ -155,20 +156,18 @@ Develop a comprehensive nutrition strategy that includes:
 
 The plan should directly address the findings from the health analysis and support the user's specific fitness goals.
 
-STEPS:
-1. Review the health analysis from the Research Assistant
-2. Create the nutrition plan content
-3. Use the File Writer Tool to save as 'personalized_nutrition_plan.md'""",
-        expected_output="""A detailed nutrition plan saved as 'personalized_nutrition_plan.md' containing:
-        - Daily caloric and macronutrient breakdown
-        - Pre/post workout nutrition strategies
-        - Optimal meal timing and frequency
-        - Hydration guidelines and recommendations
-        - Sample weekly meal plans with recipes
+Return ONLY the structured plan fields. Do not write markdown, headings or formatting -
+the plan is rendered into markdown locally. Keep each item short and specific.""",
+        expected_output="""A structured nutrition plan containing:
+        - Daily calorie range and macronutrient targets in grams
+        - Pre/post workout nutrition and hydration guidelines
+        - Meal timing recommendations
         - Supplement recommendations with timing
+        - 7-day meal plan with specific foods
         - Strategies for different training phases
-        - Progress tracking and adjustment guidelines""",
-        agent=agent
+        - Body composition and progress tracking guidelines""",
+        agent=agent,
+        output_pydantic=NutritionPlan
     )
 
 def get_user_health_data() -> ComprehensiveHealthData:
@@ -314,6 +313,40 @@ def get_user_health_data() -> ComprehensiveHealthData:
         nutrition=nutrition
     )
 
+def write_plan_files(task, renderer, filename: str):
+    """Render a task's structured plan to markdown and save it with a JSON copy.
+
+    If the output didn't validate against the plan schema, the raw LLM output is
+    saved to the markdown file instead so the plan isn't lost.
+    Returns the saved content, or None if the task produced no output at all.
+    """
+    if not task.output:
+        return None
+    
+    json_filename = os.path.splitext(filename)[0] + '.json'
+    plan = task.output.pydantic
+    if plan is None:
+        raw = task.output.raw
+        if not raw or not raw.strip():
+            return None
+        print(f"\n⚠️  {filename}: structured output failed schema validation, saving raw output instead")
+        # Don't leave a JSON copy from an earlier run that no longer matches the markdown
+        if os.path.exists(json_filename):
+            os.remove(json_filename)
+        with open(filename, 'w') as f:
+            f.write(raw)
+        return raw
+    
+    content = renderer(plan)
+    with open(filename, 'w') as f:
+        f.write(content)
+    
+    # JSON copy for downstream services that don't want to parse markdown
+    with open(json_filename, 'w') as f:
+        json.dump(plan.model_dump(), f, indent=2)
+    
+    return content
+
 def main():
     """Main function to run the CrewAI Fitness Coach system."""
     print("🏋️ MIT AI Studio - CrewAI Fitness Coach System")
@@ -374,14 +407,22 @@ def main():
         print("📄 Final Results:")
         print(result)
         
-        # Check for generated files
+        # Render the structured plans into markdown files
         files_created = []
-        for filename in ['personalized_workout_plan.md', 'personalized_nutrition_plan.md']:
-            if os.path.exists(filename):
+        plan_store = PlanVersionStore(PLAN_STORE_DIR)
+        for task, renderer, filename in [
+            (workout_task, render_workout_plan, 'personalized_workout_plan.md'),
+            (nutrition_task, render_nutrition_plan, 'personalized_nutrition_plan.md')
+        ]:
+            content = write_plan_files(task, renderer, filename)
+            if content is not None:
                 files_created.append(filename)
-                with open(filename, 'r') as f:
-                    content = f.read()
-                    print(f"\n📝 {filename} created ({len(content)} characters)")
+                print(f"\n📝 {filename} created ({len(content)} characters)")
+                try:
+                    plan_version = plan_store.save_plan(PLAN_USER_ID, filename, content)
+                    print(f"   Saved as version {plan_version.version} ({plan_version.kind}, {plan_version.stored_size} bytes stored)")
+                except Exception as e:
+                    print(f"   ⚠️  Could not save version to plan store '{PLAN_STORE_DIR}': {str(e)}")
         
         if files_created:
             print(f"\n🎉 Success! Created {len(files_created)} personalized plan(s):")
@@ -0,0 +1,130 @@
+"""
+Plan Renderer for AI Fitness Coach
+Turns structured WorkoutPlan / NutritionPlan output into the markdown plan layouts,
+so the LLM only has to generate the content and not the formatting.
+"""
+
+from typing import List
+from plan_schema import WorkoutPlan, NutritionPlan, MacroTarget, DAYS_OF_WEEK
+
+def _text(text: str) -> str:
+    """Flatten free text onto one line so it can't break the markdown structure"""
+    return ' '.join(text.split())
+
+def _table_cell(text: str) -> str:
+    """Flatten text and escape pipes so it can't break the table"""
+    return _text(text).replace('|', '\\|')
+
+def _bullets(items: List[str], indent: str = '') -> List[str]:
+    return [f"{indent}- {_text(item)}" for item in items]
+
+def _section(lines: List[str], heading: str, body: List[str]):
+    """Append a section, skipping it entirely when it has no content"""
+    if body:
+        lines += ["", heading] + body
+
+def _day_order(day: str) -> int:
+    return DAYS_OF_WEEK.index(day)
+
+def render_workout_plan(plan: WorkoutPlan) -> str:
+    """Render a WorkoutPlan as the personalized_workout_plan.md layout"""
+    lines = [
+        "# Personalized Weekly Workout Plan",
+        "",
+        "## Overview",
+        _text(plan.overview),
+        "",
+        "### Weekly Workout Schedule",
+        "| Day | Workout Type | Specific Exercises | Intensity/HR Zone |",
+        "|-----|--------------|--------------------|-------------------|",
+    ]
+    for entry in sorted(plan.weekly_schedule, key=lambda entry: _day_order(entry.day)):
+        exercises = '<br>'.join(
+            f"{i}. {_table_cell(exercise)}" for i, exercise in enumerate(entry.exercises, 1)
+        ) or 'N/A'
+        lines.append(
+            f"| {entry.day} | {_table_cell(entry.workout_type)} | "
+            f"{exercises} | {_table_cell(entry.intensity)} |"
+        )
+
+    _section(lines, "### Heart Rate Zones", [
+        f"- Zone {zone.zone} ({_text(zone.name)}): {zone.min_bpm}-{zone.max_bpm} bpm - {_text(zone.purpose)}"
+        for zone in sorted(plan.heart_rate_zones, key=lambda zone: zone.zone)
+    ])
+    _section(lines, "### Warm-Up Routine (Prior to Workouts)", [
+        f"- {_text(step.activity)}: {_text(step.duration)}" for step in plan.warm_up
+    ])
+    _section(lines, "### Cool-Down Routine (Post-Workouts)", [
+        f"- {_text(step.activity)}: {_text(step.duration)}" for step in plan.cool_down
+    ])
+    _section(lines, "### Progressive Difficulty Adjustments", [
+        f"- Week {step.week}: {_text(step.adjustment)}"
+        for step in sorted(plan.progression, key=lambda step: step.week)
+    ])
+    _section(lines, "### Recovery and Rest Day Recommendations", _bullets(plan.recovery_recommendations))
+    _section(lines, "### Injury Prevention Strategies", _bullets(plan.injury_prevention))
+    _section(lines, "### Performance Tracking Metrics", _bullets(plan.tracking_metrics))
+    _section(lines, "### Modifications for Different Fitness Levels", [
+        f"- For Beginners: {_text(plan.beginner_modifications)}",
+        f"- For Advanced: {_text(plan.advanced_modifications)}",
+    ])
+
+    if plan.closing_note and plan.closing_note.strip():
+        lines += ["", f"_{_text(plan.closing_note)}_"]
+
+    return '\n'.join(lines) + '\n'
+
+def _macro_line(name: str, target: MacroTarget) -> str:
+    line = f"  - {name}: {target.min_grams}-{target.max_grams}g"
+    if target.note:
+        line += f" ({_text(target.note)})"
+    return line
+
+def render_nutrition_plan(plan: NutritionPlan) -> str:
+    """Render a NutritionPlan as the personalized_nutrition_plan.md layout"""
+    macros = plan.macros
+    sections = []
+
+    sections.append(("Daily Caloric and Macronutrient Targets", [
+        f"- **Daily Calories:** ~{macros.min_calories:,}-{macros.max_calories:,} kcal {_text(macros.calorie_rationale)}",
+        "- **Macronutrient Breakdown:**",
+        _macro_line("Protein", macros.protein),
+        _macro_line("Carbohydrates", macros.carbohydrates),
+        _macro_line("Fats", macros.fats),
+    ]))
+
+    workout_nutrition = []
+    if plan.pre_workout:
+        workout_nutrition += ["- **Pre-Workout:**"] + _bullets(plan.pre_workout, indent='  ')
+    if plan.post_workout:
+        workout_nutrition += ["- **Post-Workout:**"] + _bullets(plan.post_workout, indent='  ')
+    sections.append(("Pre and Post-Workout Nutrition Timing Recommendations", workout_nutrition))
+
+    sections.append(("Hydration Recommendations Based on Activity Levels", _bullets(plan.hydration)))
+    sections.append(("Meal Timing for Optimal Recovery Based on Sleep and Recovery Metrics", _bullets(plan.meal_timing)))
+    sections.append(("Supplements That May Benefit Performance", [
+        f"- **{_text(supplement.name)}:** {_text(supplement.recommendation)}" for supplement in plan.supplements
+    ]))
+
+    weekly_meals = []
+    for day in sorted(plan.weekly_meals, key=lambda day: _day_order(day.day)):
+        if day.meals:
+            weekly_meals.append(f"- **{day.day}:**")
+            weekly_meals += [f"  - {_text(meal.meal)}: {_text(meal.description)}" for meal in day.meals]
+    sections.append(("Weekly Meal Planning with Specific Foods", weekly_meals))
+
+    sections.append(("Strategies for Different Training Phases", [
+        f"- **{_text(phase.phase)}:** {_text(phase.strategy)}" for phase in plan.training_phases
+    ]))
+    sections.append(("Body Composition Optimization Recommendations", _bullets(plan.body_composition)))
+    sections.append(("Progress Tracking and Adjustment Guidelines", _bullets(plan.progress_tracking)))
+
+    # Number only the sections that have content so the headings stay sequential
+    lines = ["# Personalized Nutrition Plan"]
+    number = 0
+    for heading, body in sections:
+        if body:
+            number += 1
+            _section(lines, f"## {number}. {heading}", body)
+
+    return '\n'.join(lines) + '\n'
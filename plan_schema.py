@@ -0,0 +1,152 @@
+"""
+Structured Plan Schemas for AI Fitness Coach
+Validated models the writer agents return instead of free-form markdown.
+plan_renderer turns them into the markdown plan files.
+"""
+
+from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def _normalize_day(day: str) -> str:
+    """Normalize ' monday' / 'MONDAY' to 'Monday', rejecting anything else"""
+    normalized = day.strip().capitalize()
+    if normalized not in DAYS_OF_WEEK:
+        raise ValueError(f"day must be one of {', '.join(DAYS_OF_WEEK)}, got {day!r}")
+    return normalized
+
+def _check_full_week(field_name: str, days: List[str]):
+    """Raise if days (already normalized) repeat or miss a day of the week"""
+    if sorted(days) != sorted(DAYS_OF_WEEK):
+        raise ValueError(f"{field_name} must cover each day Monday-Sunday once, got {days}")
+
+# ----- Workout plan -----
+
+class WorkoutDay(BaseModel):
+    """One day of the weekly workout schedule"""
+    day: str = Field(description="Day of the week, e.g. 'Monday'")
+    workout_type: str = Field(description="e.g. 'Strength Training', 'Rest Day'")
+    exercises: List[str] = Field(description="Exercises with sets/reps, e.g. 'Squats (3x10)'")
+    intensity: str = Field(description="Intensity and HR zone, e.g. 'Moderate (Zone 2)'")
+
+    @field_validator('day')
+    @classmethod
+    def normalize_day(cls, value: str) -> str:
+        return _normalize_day(value)
+
+class HeartRateZone(BaseModel):
+    """Target heart rate zone computed from the user's metrics"""
+    zone: int = Field(ge=1, le=5)
+    name: str = Field(description="e.g. 'Aerobic'")
+    min_bpm: int = Field(gt=0)
+    max_bpm: int = Field(gt=0)
+    purpose: str
+
+    @model_validator(mode='after')
+    def check_range(self):
+        if self.min_bpm > self.max_bpm:
+            raise ValueError("min_bpm must not exceed max_bpm")
+        return self
+
+class RoutineStep(BaseModel):
+    """A warm-up or cool-down activity"""
+    activity: str
+    duration: str = Field(description="e.g. '2 mins'")
+
+class WeeklyProgression(BaseModel):
+    """How the plan changes in a given week"""
+    week: int = Field(ge=1)
+    adjustment: str
+
+class WorkoutPlan(BaseModel):
+    """Complete personalized workout plan"""
+    overview: str
+    weekly_schedule: List[WorkoutDay] = Field(min_length=7, max_length=7)
+    heart_rate_zones: List[HeartRateZone]
+    warm_up: List[RoutineStep]
+    cool_down: List[RoutineStep]
+    progression: List[WeeklyProgression]
+    recovery_recommendations: List[str]
+    injury_prevention: List[str]
+    tracking_metrics: List[str]
+    beginner_modifications: str
+    advanced_modifications: str
+    closing_note: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_days(self):
+        _check_full_week('weekly_schedule', [entry.day for entry in self.weekly_schedule])
+        return self
+
+# ----- Nutrition plan -----
+
+class MacroTarget(BaseModel):
+    """Daily target range for one macronutrient"""
+    min_grams: int = Field(ge=0)
+    max_grams: int = Field(ge=0)
+    note: Optional[str] = Field(default=None, description="e.g. '1.6-2.2g/kg'")
+
+    @model_validator(mode='after')
+    def check_range(self):
+        if self.min_grams > self.max_grams:
+            raise ValueError("min_grams must not exceed max_grams")
+        return self
+
+class MacroTargets(BaseModel):
+    """Daily calorie and macronutrient targets"""
+    min_calories: int = Field(gt=0)
+    max_calories: int = Field(gt=0)
+    calorie_rationale: str
+    protein: MacroTarget
+    carbohydrates: MacroTarget
+    fats: MacroTarget
+
+    @model_validator(mode='after')
+    def check_range(self):
+        if self.min_calories > self.max_calories:
+            raise ValueError("min_calories must not exceed max_calories")
+        return self
+
+class Supplement(BaseModel):
+    """A supplement recommendation"""
+    name: str
+    recommendation: str = Field(description="Dose, timing and purpose")
+
+class Meal(BaseModel):
+    """A single meal or snack"""
+    meal: str = Field(description="e.g. 'Breakfast', 'Snack'")
+    description: str
+
+class DayMeals(BaseModel):
+    """Meals for one day of the week"""
+    day: str = Field(description="Day of the week, e.g. 'Monday'")
+    meals: List[Meal]
+
+    @field_validator('day')
+    @classmethod
+    def normalize_day(cls, value: str) -> str:
+        return _normalize_day(value)
+
+class PhaseStrategy(BaseModel):
+    """Nutrition strategy for a training phase"""
+    phase: str = Field(description="e.g. 'Strength Phase'")
+    strategy: str
+
+class NutritionPlan(BaseModel):
+    """Complete personalized nutrition plan"""
+    macros: MacroTargets
+    pre_workout: List[str]
+    post_workout: List[str]
+    hydration: List[str]
+    meal_timing: List[str]
+    supplements: List[Supplement]
+    weekly_meals: List[DayMeals] = Field(min_length=7, max_length=7)
+    training_phases: List[PhaseStrategy]
+    body_composition: List[str]
+    progress_tracking: List[str]
+
+    @model_validator(mode='after')
+    def check_days(self):
+        _check_full_week('weekly_meals', [entry.day for entry in self.weekly_meals])
+        return self
@@ -0,0 +1,354 @@
+"""
+Plan Version Store for AI Fitness Coach
+Saves each regenerated plan as a line delta against the user's previous version,
+with a full snapshot every few versions so any version can be rebuilt quickly.
+"""
+
+import difflib
+import fcntl
+import hashlib
+import json
+import os
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional, Dict, List, Any
+from urllib.parse import quote
+
+# A delta is a list of operations applied in order against the base version's lines:
+#   ["=", start, end]   copy base lines[start:end]
+#   ["+", [lines...]]   insert new lines
+Delta = List[List[Any]]
+
+DEFAULT_SNAPSHOT_INTERVAL = 8
+
+@dataclass
+class PlanVersion:
+    """Metadata for one stored version of a plan"""
+    version: int
+    kind: str  # "full" or "delta"
+    base_version: Optional[int]  # version the delta applies to, None for snapshots
+    created_at: str  # ISO timestamp
+    sha256: str  # hash of the reconstructed plan text
+    text_size: int  # bytes of the plan text
+    stored_size: int  # bytes written to disk
+
+def compute_delta(old_text: str, new_text: str) -> Delta:
+    """Compute a line-based delta that turns old_text into new_text"""
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append(['=', i1, i2])
+        elif j2 > j1:  # 'replace' or 'insert'; 'delete' just skips base lines
+            delta.append(['+', new_lines[j1:j2]])
+    return delta
+
+def apply_delta(old_text: str, delta: Delta) -> str:
+    """Rebuild the new text from old_text and a delta from compute_delta()"""
+    old_lines = old_text.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in delta:
+        if op[0] == '=':
+            parts.extend(old_lines[op[1]:op[2]])
+        elif op[0] == '+':
+            parts.extend(op[1])
+        else:
+            raise ValueError(f"Unknown delta operation: {op[0]!r}")
+    return ''.join(parts)
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _safe_name(value: str) -> str:
+    """Percent-encode a user id or plan name into a directory name.
+
+    The encoding is reversible (urllib.parse.unquote), so distinct ids such as
+    'a/b' and 'a_b' never share a history.
+    """
+    if not value:
+        raise ValueError(f"Invalid name: {value!r}")
+    encoded = quote(value, safe='')
+    if encoded in ('.', '..'):
+        encoded = encoded.replace('.', '%2E')
+    return encoded
+
+class PlanVersionStore:
+    """
+    File-based store of plan versions, one history per (user, plan name).
+
+    Layout: <root>/<user_id>/<plan_name>/index.json plus one zlib-compressed
+    JSON payload per version (000001.full, 000002.delta, ...). Path components
+    are percent-encoded, and writers hold a per-history lock file.
+    """
+
+    def __init__(self, root_dir: str = 'plan_versions', snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be at least 1")
+        self.root_dir = root_dir
+        self.snapshot_interval = snapshot_interval
+        # Latest text per history, so saving a new version doesn't replay the chain
+        self._latest_cache: Dict[str, str] = {}
+
+    # ----- paths and index -----
+
+    def _plan_dir(self, user_id: str, plan_name: str) -> str:
+        return os.path.join(self.root_dir, _safe_name(user_id), _safe_name(plan_name))
+
+    def _version_path(self, plan_dir: str, entry: PlanVersion) -> str:
+        return os.path.join(plan_dir, f"{entry.version:06d}.{entry.kind}")
+
+    def _load_index(self, plan_dir: str) -> List[PlanVersion]:
+        index_path = os.path.join(plan_dir, 'index.json')
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, 'r') as f:
+            return [PlanVersion(**entry) for entry in json.load(f)]
+
+    def _write_index(self, plan_dir: str, index: List[PlanVersion]):
+        index_path = os.path.join(plan_dir, 'index.json')
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump([asdict(entry) for entry in index], f, indent=1)
+        os.replace(tmp_path, index_path)
+
+    def _read_payload(self, plan_dir: str, entry: PlanVersion) -> Any:
+        with open(self._version_path(plan_dir, entry), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+    def _write_payload(self, plan_dir: str, entry: PlanVersion, payload: Any) -> int:
+        data = zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'), 9)
+        version_path = self._version_path(plan_dir, entry)
+        tmp_path = version_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, version_path)
+        return len(data)
+
+    @contextmanager
+    def _locked(self, plan_dir: str):
+        """Hold an exclusive lock on a plan history across processes"""
+        with open(os.path.join(plan_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ----- public API -----
+
+    def list_versions(self, user_id: str, plan_name: str) -> List[PlanVersion]:
+        """Return metadata for every stored version, oldest first"""
+        return self._load_index(self._plan_dir(user_id, plan_name))
+
+    def latest_version(self, user_id: str, plan_name: str) -> Optional[int]:
+        """Return the newest version number, or None if nothing is stored"""
+        index = self.list_versions(user_id, plan_name)
+        return index[-1].version if index else None
+
+    def save_plan(self, user_id: str, plan_name: str, text: str) -> PlanVersion:
+        """Store a new version of a plan and return its metadata.
+
+        Saving text identical to the latest version is a no-op that returns
+        the existing latest version.
+        """
+        plan_dir = self._plan_dir(user_id, plan_name)
+        os.makedirs(plan_dir, exist_ok=True)
+        with self._locked(plan_dir):
+            index = self._load_index(plan_dir)
+            text_hash = _sha256(text)
+
+            if index and index[-1].sha256 == text_hash:
+                return index[-1]
+
+            version = index[-1].version + 1 if index else 1
+            since_snapshot = 0
+            for entry in reversed(index):
+                if entry.kind == 'full':
+                    break
+                since_snapshot += 1
+
+            entry = PlanVersion(
+                version=version,
+                kind='full',
+                base_version=None,
+                created_at=datetime.now().isoformat(),
+                sha256=text_hash,
+                text_size=len(text.encode('utf-8')),
+                stored_size=0
+            )
+
+            if index and since_snapshot + 1 < self.snapshot_interval:
+                previous_text = self._latest_text(plan_dir, index)
+                entry.kind = 'delta'
+                entry.base_version = index[-1].version
+                payload: Any = compute_delta(previous_text, text)
+            else:
+                payload = text
+
+            entry.stored_size = self._write_payload(plan_dir, entry, payload)
+            index.append(entry)
+            self._write_index(plan_dir, index)
+            self._latest_cache[plan_dir] = text
+            return entry
+
+    def get_plan(self, user_id: str, plan_name: str, version: Optional[int] = None) -> str:
+        """Reconstruct a plan version (the latest if version is None)"""
+        plan_dir = self._plan_dir(user_id, plan_name)
+        index = self._load_index(plan_dir)
+        if not index:
+            raise KeyError(f"No versions stored for {user_id}/{plan_name}")
+        if version is None or version == index[-1].version:
+            return self._latest_text(plan_dir, index)
+        return self._reconstruct(plan_dir, index, version)
+
+    def get_diff(self, user_id: str, plan_name: str, from_version: int,
+                 to_version: Optional[int] = None) -> Dict[str, Any]:
+        """Return only the delta needed to go from one version to another.
+
+        Clients holding from_version can call apply_delta() on the returned
+        "delta" to get to_version, then compare against "sha256".
+        """
+        plan_dir = self._plan_dir(user_id, plan_name)
+        index = self._load_index(plan_dir)
+        if not index:
+            raise KeyError(f"No versions stored for {user_id}/{plan_name}")
+        if to_version is None:
+            to_version = index[-1].version
+        target = self._entry(index, to_version)
+
+        if target.kind == 'delta' and target.base_version == from_version:
+            delta = self._read_payload(plan_dir, target)
+        else:
+            old_text = self._reconstruct(plan_dir, index, from_version)
+            new_text = self.get_plan(user_id, plan_name, to_version)
+            delta = compute_delta(old_text, new_text)
+
+        return {
+            'user_id': user_id,
+            'plan_name': plan_name,
+            'from_version': from_version,
+            'to_version': to_version,
+            'sha256': target.sha256,
+            'delta': delta
+        }
+
+    # ----- reconstruction -----
+
+    def _entry(self, index: List[PlanVersion], version: int) -> PlanVersion:
+        # Versions are numbered 1..N with no gaps
+        if version < 1 or version > len(index):
+            raise KeyError(f"Version {version} not found")
+        return index[version - 1]
+
+    def _latest_text(self, plan_dir: str, index: List[PlanVersion]) -> str:
+        cached = self._latest_cache.get(plan_dir)
+        if cached is not None and _sha256(cached) == index[-1].sha256:
+            return cached
+        text = self._reconstruct(plan_dir, index, index[-1].version)
+        self._latest_cache[plan_dir] = text
+        return text
+
+    def _reconstruct(self, plan_dir: str, index: List[PlanVersion], version: int) -> str:
+        """Load the nearest snapshot at or before version and replay deltas forward"""
+        target = self._entry(index, version)
+        chain: List[PlanVersion] = []
+        entry = target
+        while entry.kind == 'delta':
+            chain.append(entry)
+            entry = self._entry(index, entry.base_version)
+
+        text = self._read_payload(plan_dir, entry)
+        for delta_entry in reversed(chain):
+            text = apply_delta(text, self._read_payload(plan_dir, delta_entry))
+
+        if _sha256(text) != target.sha256:
+            raise ValueError(f"Checksum mismatch reconstructing version {version} in {plan_dir}")
+        return text
+
+def _simulate_weekly_edit(text: str, week: int) -> str:
+    """Make a small week-over-week change like a regenerated plan would"""
+    lines = text.splitlines(keepends=True)
+    if not lines:
+        return f"Week {week}\n"
+    position = (week * 7) % len(lines)
+    lines[position] = lines[position].rstrip('\n') + f" (week {week} update)\n"
+    lines.insert((week * 13) % len(lines), f"- Week {week} adjustment: progress check-in\n")
+    return ''.join(lines)
+
+def run_benchmark(weeks: int = 52, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+                  plan_files: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Benchmark storage savings and reconstruction time against full copies"""
+    import shutil
+    import tempfile
+
+    plan_files = plan_files or ['personalized_workout_plan.md', 'personalized_nutrition_plan.md']
+    results: Dict[str, Dict[str, float]] = {}
+    root_dir = tempfile.mkdtemp(prefix='plan_versions_bench_')
+    try:
+        store = PlanVersionStore(root_dir, snapshot_interval=snapshot_interval)
+        for plan_file in plan_files:
+            if not os.path.exists(plan_file):
+                continue
+            with open(plan_file, 'r') as f:
+                text = f.read()
+
+            full_copy_bytes = 0
+            compressed_copy_bytes = 0
+            save_start = time.perf_counter()
+            for week in range(1, weeks + 1):
+                text = _simulate_weekly_edit(text, week)
+                full_copy_bytes += len(text.encode('utf-8'))
+                compressed_copy_bytes += len(zlib.compress(text.encode('utf-8'), 9))
+                store.save_plan('bench_user', plan_file, text)
+            save_seconds = time.perf_counter() - save_start
+
+            versions = store.list_versions('bench_user', plan_file)
+            stored_bytes = sum(entry.stored_size for entry in versions)
+
+            # Fresh store so reconstruction can't use the latest-text cache
+            reader = PlanVersionStore(root_dir, snapshot_interval=snapshot_interval)
+            read_start = time.perf_counter()
+            for entry in versions:
+                reader.get_plan('bench_user', plan_file, entry.version)
+            read_seconds = time.perf_counter() - read_start
+
+            diff_start = time.perf_counter()
+            diff = reader.get_diff('bench_user', plan_file, weeks - 1)
+            diff_seconds = time.perf_counter() - diff_start
+            diff_bytes = len(json.dumps(diff['delta']).encode('utf-8'))
+
+            results[plan_file] = {
+                'versions': len(versions),
+                'full_copy_bytes': full_copy_bytes,
+                'compressed_copy_bytes': compressed_copy_bytes,
+                'stored_bytes': stored_bytes,
+                'savings_percent': 100.0 * (1 - stored_bytes / full_copy_bytes),
+                'avg_save_ms': 1000 * save_seconds / len(versions),
+                'avg_reconstruct_ms': 1000 * read_seconds / len(versions),
+                'latest_diff_bytes': diff_bytes,
+                'latest_full_bytes': versions[-1].text_size,
+                'diff_fetch_ms': 1000 * diff_seconds
+            }
+    finally:
+        shutil.rmtree(root_dir, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    print("📦 Plan Version Store Benchmark")
+    print("=" * 60)
+    for plan_file, stats in run_benchmark().items():
+        print(f"\n📝 {plan_file} ({stats['versions']} weekly versions)")
+        print(f"   Full copies:        {stats['full_copy_bytes']:,} bytes")
+        print(f"   Compressed copies:  {stats['compressed_copy_bytes']:,} bytes")
+        print(f"   Delta store:        {stats['stored_bytes']:,} bytes "
+              f"({stats['savings_percent']:.1f}% saved)")
+        print(f"   Avg save:           {stats['avg_save_ms']:.2f} ms")
+        print(f"   Avg reconstruction: {stats['avg_reconstruct_ms']:.2f} ms")
+        print(f"   Latest diff:        {stats['latest_diff_bytes']:,} bytes vs "
+              f"{stats['latest_full_bytes']:,} bytes full "
+              f"({stats['diff_fetch_ms']:.2f} ms)")